@@ -54,7 +54,6 @@ class Connection(QObject, ObservableProperties):
 
     async def _sign_in(self, url: str):
         self._client = CloudClient(url)
-        self.state = ConnectionState.auth_requesting
         try:
             sign_in = self._client.sign_in()
             url = await anext(sign_in)
@@ -71,6 +70,10 @@ class Connection(QObject, ObservableProperties):
             self.state = ConnectionState.auth_error
 
     def sign_in(self):
+        if self.state in [ConnectionState.auth_requesting, ConnectionState.auth_pending]:
+            return  # sign-in already in progress
+        # Set state before the task runs, so repeated clicks are rejected synchronously
+        self.state = ConnectionState.auth_requesting
         eventloop.run(self._sign_in(CloudClient.default_api_url))
 
     async def _connect(self, url: str, mode: ServerMode, access_token=""):
@@ -47,6 +47,7 @@ class AIToolsExtension(Extension):
         eventloop.run(root.autostart(self._settings_dialog.connection.update_ui))
 
     def shutdown(self):
+        settings.save()  # write changes which are still scheduled
         root.server.terminate()
         eventloop.stop()
 
@@ -76,9 +76,10 @@ class File:
             return self.hash
         assert self.path is not None, "Local filepath must be set to compute hash"
         sha = hashlib.sha256()
-        with open(self.path, "rb") as f:
-            while chunk := f.read(4096):
-                sha.update(chunk)
+        buffer = memoryview(bytearray(2**18))  # reused for all reads to avoid copies
+        with open(self.path, "rb", buffering=0) as f:
+            while size := f.readinto(buffer):
+                sha.update(buffer[:size])
         self.hash = b64encode(sha.digest()).decode()
         return self.hash
 
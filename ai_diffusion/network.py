@@ -1,9 +1,10 @@
 from __future__ import annotations
 import asyncio
+import hashlib
 import json
 import os
+import time
 from asyncio import Future
-from datetime import datetime
 from pathlib import Path
 from typing import NamedTuple
 from PyQt5.QtCore import QByteArray, QUrl, QFile, QBuffer
@@ -39,13 +40,14 @@ class NetworkError(Exception):
         url = reply.url().toString()
         status = reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute)
         if reply.isReadable():
+            payload = reply.readAll().data()
             try:  # extract detailed information from the payload
-                data = json.loads(reply.readAll().data())
+                data = json.loads(payload)
                 error = data.get("error", "Network error")
                 return NetworkError(code, f"{error} ({reply.errorString()})", url, status, data)
             except Exception:
                 try:
-                    text = reply.readAll().data().decode("utf-8")
+                    text = payload.decode("utf-8")
                     if text:
                         return NetworkError(code, f"{text} ({reply.errorString()})", url, status)
                 except Exception:
@@ -68,23 +70,74 @@ class Disconnected(Exception):
         super().__init__(self, "Disconnected")
 
 
+class HashedFile:
+    """Writes downloaded data to a file and computes its SHA-256 hash in the same pass."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = QFile(str(path))
+        if not self._file.open(QFile.OpenModeFlag.WriteOnly):
+            raise Exception(
+                _("Error during download: could not open {path} for writing", path=path)
+            )
+        self.hash = hashlib.sha256()
+        # Errors are stored rather than raised, writes happen inside Qt signal handlers
+        self.error: OSError | None = None
+
+    def write(self, data: QByteArray):
+        if self.error is not None:
+            return
+        self.hash.update(data.data())
+        if self._file.write(data) != data.size():
+            self._set_error()
+
+    def close(self):
+        if self.error is None and not self._file.flush():
+            self._set_error()
+        self._file.close()
+
+    def _set_error(self):
+        self.error = OSError(f"Failed to write {self.path}: {self._file.errorString()}")
+
+
 class Request(NamedTuple):
     url: str
     future: asyncio.Future
     buffer: QBuffer | None = None
+    stream: HashedFile | None = None
 
 
 Headers = list[tuple[str, str]]
 
 
+_shared_network: QNetworkAccessManager | None = None
+
+
+def shared_network():
+    """QNetworkAccessManager used for all requests, so that its connections are reused."""
+    global _shared_network
+    if _shared_network is None:
+        _shared_network = QNetworkAccessManager()
+        _shared_network.sslErrors.connect(_handle_ssl_errors)
+    return _shared_network
+
+
+def _handle_ssl_errors(reply: QNetworkReply, errors: list[QSslError]):
+    for error in errors:
+        log.warning(f"SSL error: {error.errorString()} [{error.error()}]")
+
+
 class RequestManager:
     def __init__(self):
-        self._net = QNetworkAccessManager()
-        self._net.finished.connect(self._finished)
-        self._net.sslErrors.connect(self._handle_ssl_errors)
+        self._net = shared_network()
         self._requests: dict[QNetworkReply, Request] = {}
         self._upload_future: Future[tuple[int, int]] | None = None
 
+        # Attributes shared by all requests, copied instead of being set up for each request
+        self._prototype = QNetworkRequest()
+        self._prototype.setAttribute(QNetworkRequest.Attribute.FollowRedirectsAttribute, True)
+        self._prototype.setAttribute(QNetworkRequest.Attribute.Http2AllowedAttribute, True)
+
     def http(
         self,
         method,
@@ -94,10 +147,7 @@ class RequestManager:
         headers: Headers | None = None,
         timeout: float | None = None,
     ):
-        self._cleanup()
-
-        request = QNetworkRequest(QUrl(url))
-        request.setAttribute(QNetworkRequest.FollowRedirectsAttribute, True)
+        request = self._request(url)
         request.setRawHeader(b"ngrok-skip-browser-warning", b"69420")
         if bearer:
             request.setRawHeader(b"Authorization", f"Bearer {bearer}".encode("utf-8"))
@@ -128,7 +178,7 @@ class RequestManager:
 
         assert reply is not None, f"Network request for {url} failed: reply is None"
         future = asyncio.get_running_loop().create_future()
-        self._requests[reply] = Request(url, future)
+        self._track(reply, Request(url, future))
         return future
 
     def get(self, url: str, bearer="", timeout: float | None = None, headers: Headers | None = None):
@@ -141,13 +191,11 @@ class RequestManager:
         return self.http("PUT", url, data, headers=headers)
 
     async def upload(self, url: str, data: QByteArray | bytes, sha256: str | None = None):
-        self._cleanup()
         if isinstance(data, bytes):
             data = QByteArray(data)
         assert isinstance(data, QByteArray)
 
-        request = QNetworkRequest(QUrl(url))
-        request.setAttribute(QNetworkRequest.Attribute.FollowRedirectsAttribute, True)
+        request = self._request(url)
         if sha256:
             request.setRawHeader(b"x-amz-checksum-sha256", sha256.encode("utf-8"))
         request.setHeader(
@@ -160,7 +208,7 @@ class RequestManager:
         reply.uploadProgress.connect(self._upload_progress)
         self._upload_future = asyncio.get_running_loop().create_future()
         finished_future = asyncio.get_running_loop().create_future()
-        self._requests[reply] = Request(url, finished_future)
+        self._track(reply, Request(url, finished_future))
         while self._upload_future is not None:
             fut = next(asyncio.as_completed([self._upload_future, finished_future]))
             progress = await fut
@@ -172,9 +220,7 @@ class RequestManager:
                 break
 
     def download(self, url: str):
-        self._cleanup()
-        request = QNetworkRequest(QUrl(url))
-        request.setAttribute(QNetworkRequest.Attribute.FollowRedirectsAttribute, True)
+        request = self._request(url)
         reply = self._net.get(request)
         assert reply is not None, f"Network request for {url} failed: reply is None"
 
@@ -187,7 +233,25 @@ class RequestManager:
         future = asyncio.get_running_loop().create_future()
         tracker = Request(url, future, buffer)
         reply.downloadProgress.connect(write)
-        self._requests[reply] = tracker
+        self._track(reply, tracker)
+        return future
+
+    def download_to(self, url: str, path: Path):
+        """Download into a file without buffering in memory. Returns the SHA-256 hash object."""
+        request = self._request(url)
+        stream = HashedFile(path)
+        reply = self._net.get(request)
+        assert reply is not None, f"Network request for {url} failed: reply is None"
+
+        def write(bytes_received, bytes_total):
+            stream.write(reply.readAll())
+            if stream.error is not None:
+                reply.abort()  # no point in downloading the rest
+
+        future = asyncio.get_running_loop().create_future()
+        tracker = Request(url, future, stream=stream)
+        reply.downloadProgress.connect(write)
+        self._track(reply, tracker)
         return future
 
     def _upload_progress(self, bytes_sent: int, bytes_total: int):
@@ -205,12 +269,20 @@ class RequestManager:
             code = reply.error()  # type: ignore (bug in PyQt5-stubs)
             tracker = self._requests[reply]
             future = tracker.future
+            if tracker.stream is not None:
+                if code == QNetworkReply.NetworkError.NoError:
+                    tracker.stream.write(reply.readAll())
+                tracker.stream.close()
             if future.cancelled():
                 return  # operation was cancelled, discard result
-            if code == QNetworkReply.NetworkError.NoError:
+            if tracker.stream is not None and tracker.stream.error is not None:
+                future.set_exception(tracker.stream.error)
+            elif code == QNetworkReply.NetworkError.NoError:
                 if tracker.buffer is not None:
                     tracker.buffer.write(reply.readAll())
                     future.set_result(tracker.buffer.data())
+                elif tracker.stream is not None:
+                    future.set_result(tracker.stream.hash)
                 else:
                     content_type = reply.header(QNetworkRequest.KnownHeaders.ContentTypeHeader)
                     data = reply.readAll().data()
@@ -223,15 +295,19 @@ class RequestManager:
         except Exception as e:
             if future is not None:
                 future.set_exception(e)
+        finally:
+            self._requests.pop(reply, None)
+            reply.deleteLater()
 
-    def _cleanup(self):
-        self._requests = {
-            reply: request for reply, request in self._requests.items() if not reply.isFinished()
-        }
+    def _request(self, url: str):
+        request = QNetworkRequest(self._prototype)
+        request.setUrl(QUrl(url))
+        return request
 
-    def _handle_ssl_errors(self, reply: QNetworkReply, errors: list[QSslError]):
-        for error in errors:
-            log.warning(f"SSL error: {error.errorString()} [{error.error()}]")
+    def _track(self, reply: QNetworkReply, request: Request):
+        # The network manager is shared, connect to the reply to only receive our own results
+        self._requests[reply] = request
+        reply.finished.connect(lambda: self._finished(reply))
 
 
 class DownloadProgress(NamedTuple):
@@ -245,7 +321,7 @@ class DownloadHelper:
     _initial = 0
     _total = 0
     _received = 0
-    _time: datetime | None = None
+    _time: float | None = None
 
     def __init__(self, resume_from: int = 0):
         self._initial = resume_from / 10**6
@@ -254,12 +330,12 @@ class DownloadHelper:
         received = received_bytes / 10**6
         total = total_bytes / 10**6
         diff = received - self._received
-        now = datetime.now()
+        now = time.monotonic()
         speed = 0
         self._received = received
         self._total = max(self._total, total)
         if self._time is not None:
-            speed = diff / max((now - self._time).total_seconds(), 0.0001)
+            speed = diff / max(now - self._time, 0.0001)
         self._time = now
         current = self._initial + self._received
         total = 0
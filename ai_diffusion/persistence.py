@@ -88,7 +88,7 @@ class RecentlyUsedSync:
 
     def _save(self):
         settings.document_defaults = asdict(self)
-        settings.save()
+        settings.schedule_save()
 
 
 @dataclass
@@ -46,7 +46,7 @@ class Root(QObject):
         self._recent = RecentlyUsedSync.from_settings()
         self._auto_update = AutoUpdate()
         if settings.auto_update:
-            self._auto_update.check()
+            self._auto_update.check(max_age=settings.update_check_interval)
         self._connection.message_received.connect(self._handle_message)
         self._connection.models_changed.connect(self._update_files)
 
@@ -6,7 +6,7 @@ from enum import Enum
 from pathlib import Path
 import random
 from typing import NamedTuple, Optional, Any
-from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
 
 from .util import is_macos, is_windows, user_data_dir, client_logger as log
 from .util import encode_json, read_json_with_comments
@@ -101,6 +101,14 @@ class Setting:
             return self.default
 
 
+def _file_stat(path: Path):
+    try:
+        stat = path.stat()
+        return (stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        return None
+
+
 class Settings(QObject):
     default_path = user_data_dir / "settings.json"
     headers: dict = {}
@@ -117,6 +125,13 @@ class Settings(QObject):
         _("Enable Automatic Updates"), True, _("Check for new versions of the plugin on startup")
     )
 
+    update_check_interval: int
+    _update_check_interval = Setting(
+        _("Update Check Interval"),
+        3600,
+        _("Minimum time in seconds before checking for a new plugin version again on startup"),
+    )
+
     server_mode: ServerMode
     _server_mode = Setting(
         _("Server Management"),
@@ -345,10 +360,17 @@ class Settings(QObject):
     changed = pyqtSignal(str, object)
 
     _values: dict[str, Any]
+    # Path, contents and file stat (mtime, size) of the last write, to skip redundant writes.
+    # The stat detects if the file was modified by someone else since.
+    _last_saved: tuple[Path, str, tuple[int, int] | None] | None = None
 
     def __init__(self):
         super().__init__()
         self.restore(init=True)
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(500)
+        self._save_timer.timeout.connect(self.save)
 
     def __getattr__(self, name: str):
         if name in self._values:
@@ -374,9 +396,18 @@ class Settings(QObject):
             self.server_mode = ServerMode.managed
 
     def save(self, path: Optional[Path] = None):
+        self._save_timer.stop()
         path = self.default_path or path
+        contents = json.dumps(self._values, default=encode_json, indent=4)
+        if self._last_saved == (path, contents, _file_stat(path)):
+            return  # nothing changed since the last write
         with open(path, "w") as file:
-            file.write(json.dumps(self._values, default=encode_json, indent=4))
+            file.write(contents)
+        self._last_saved = (path, contents, _file_stat(path))
+
+    def schedule_save(self):
+        """Save after a short delay, so that a burst of changes results in a single write."""
+        self._save_timer.start()
 
     def pre_load_server(self):
         # TODO 从这边读取服务器配置
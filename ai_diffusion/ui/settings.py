@@ -198,6 +198,7 @@ class CloudWidget(QWidget):
                 self._sign_out_button.setVisible(True)
 
     def _connect(self):
+        self.connect_button.setEnabled(False)  # re-enabled when the connection state changes
         connection = root.connection
         if connection.state in [ConnectionState.auth_missing, ConnectionState.auth_error]:
             connection.sign_in()
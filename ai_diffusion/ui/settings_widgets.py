@@ -468,7 +468,7 @@ class SettingsTab(QWidget):
                 if widget.enabled:
                     setattr(settings, name, widget.value)
             self._write()
-            settings.save()
+            settings.schedule_save()
 
 
 class SettingsWriteGuard:
@@ -1,7 +1,11 @@
+import json
 import os
-import shutil
-import hashlib
+import posixpath
+import threading
+import time
+import zipfile
 
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from pathlib import Path
 from tempfile import TemporaryDirectory
@@ -11,7 +15,7 @@ from PyQt5.QtCore import QObject, pyqtSignal
 from . import __version__, eventloop
 from .network import RequestManager
 from .properties import ObservableProperties, Property
-from .util import ZipFile, client_logger as log
+from .util import ZipFile, user_data_dir, client_logger as log
 
 
 class UpdateState(Enum):
@@ -56,35 +60,41 @@ class AutoUpdate(QObject, ObservableProperties):
         self._package: UpdatePackage | None = None
         self._temp_dir: TemporaryDirectory | None = None
         self._request_manager: RequestManager | None = None
+        self._cache_path = user_data_dir / "plugin_update.json"
 
-    def check(self):
+    def check(self, max_age: float = 0):
+        """Check for a new plugin version, re-using a previous result if younger than `max_age`."""
         return eventloop.run(
             self._handle_errors(
-                self._check, UpdateState.failed_check, "Failed to check for new plugin version"
+                lambda: self._check(max_age),
+                UpdateState.failed_check,
+                "Failed to check for new plugin version",
             )
         )
 
-    async def _check(self):
+    async def _check(self, max_age: float = 0):
         if self.state is UpdateState.restart_required:
             return
 
         self.state = UpdateState.checking
-        log.info(f"Checking for latest plugin version at {self.api_url}")
-        result = await self._net.get(
-            f"{self.api_url}/plugin/latest?version={self.current_version}", timeout=10
-        )
+        url = f"{self.api_url}/plugin/latest?version={self.current_version}"
+        result = self._read_cache(url, max_age)
+        is_cached = result is not None
+        if result is None:
+            log.info(f"Checking for latest plugin version at {self.api_url}")
+            result = await self._net.get(url, timeout=10)
         self.latest_version = result.get("version")
         if not self.latest_version:
             log.error(f"Invalid plugin update information: {result}")
-            self.state = UpdateState.failed_check
-            self.error = "Failed to retrieve plugin update information"
+            self._fail(UpdateState.failed_check, "Failed to retrieve plugin update information")
         elif self.latest_version == self.current_version:
             log.info("Plugin is up to date!")
+            if not is_cached:
+                self._write_cache(url, result)
             self.state = UpdateState.latest
-        elif "url" not in result or "sha256" not in result:
+        elif not result.get("url") or not result.get("sha256"):
             log.error(f"Invalid plugin update information: {result}")
-            self.state = UpdateState.failed_check
-            self.error = "Plugin update package is incomplete"
+            self._fail(UpdateState.failed_check, "Plugin update package is incomplete")
         else:
             log.info(f"New plugin version available: {self.latest_version}")
             self._package = UpdatePackage(
@@ -92,6 +102,8 @@ class AutoUpdate(QObject, ObservableProperties):
                 url=result["url"],
                 sha256=result["sha256"],
             )
+            if not is_cached:
+                self._write_cache(url, result)
             self.state = UpdateState.available
 
     def run(self):
@@ -106,22 +118,16 @@ class AutoUpdate(QObject, ObservableProperties):
         archive_path = Path(self._temp_dir.name) / f"krita_ai_diffusion-{self.latest_version}.zip"
         log.info(f"Downloading plugin update {self._package.url}")
         self.state = UpdateState.downloading
-        archive_data = await self._net.download(self._package.url)
+        digest = await self._net.download_to(self._package.url, archive_path)
 
-        sha256 = hashlib.sha256(archive_data).hexdigest()
+        sha256 = digest.hexdigest()
         if sha256 != self._package.sha256:
             log.error(f"Update package hash mismatch: {sha256} != {self._package.sha256}")
             raise RuntimeError("Downloaded plugin package is corrupted or incomplete")
 
-        archive_path.write_bytes(archive_data)
-        source_dir = Path(self._temp_dir.name) / f"krita_ai_diffusion-{self.latest_version}"
-        log.info(f"Extracting plugin archive into {source_dir}")
-        self.state = UpdateState.installing
-        with ZipFile(archive_path) as zip_file:
-            zip_file.extractall(source_dir)
-
         log.info(f"Installing new plugin version to {self.plugin_dir}")
-        shutil.copytree(source_dir, self.plugin_dir, dirs_exist_ok=True)
+        self.state = UpdateState.installing
+        _extract_parallel(archive_path, self.plugin_dir)
         self.current_version = self.latest_version
         self.state = UpdateState.restart_required
 
@@ -135,11 +141,64 @@ class AutoUpdate(QObject, ObservableProperties):
             self._request_manager = RequestManager()
         return self._request_manager
 
+    def _read_cache(self, url: str, max_age: float) -> dict | None:
+        if max_age <= 0 or not self._cache_path.exists():
+            return None
+        try:
+            age = time.time() - self._cache_path.stat().st_mtime
+            if 0 <= age < max_age:  # negative if the clock was turned back, treat as stale
+                cached = json.loads(self._cache_path.read_text())
+                if cached.get("url") == url:
+                    log.info(f"Using plugin update information cached in {self._cache_path}")
+                    return cached["result"]
+        except Exception as e:
+            log.warning(f"Failed to read plugin update cache {self._cache_path}: {e}")
+        return None
+
+    def _write_cache(self, url: str, result: dict):
+        try:
+            self._cache_path.write_text(json.dumps({"url": url, "result": result}))
+        except Exception as e:
+            log.warning(f"Failed to write plugin update cache {self._cache_path}: {e}")
+
     async def _handle_errors(self, func, error_state: UpdateState, message: str):
         try:
             return await func()
         except Exception as e:
             log.exception(e)
-            self.error = f"{message}: {e}"
-            self.state = error_state
+            self._fail(error_state, f"{message}: {e}")
             return None
+
+    def _fail(self, state: UpdateState, error: str):
+        # Set the error first, so it is already up-to-date when state_changed is emitted
+        self.error = error
+        self.state = state
+
+
+def _extract_parallel(archive_path: Path, target_dir: Path):
+    """Extract all files of a zip archive using a thread pool (zlib releases the GIL)."""
+    with ZipFile(archive_path) as zip_file:
+        members = zip_file.infolist()
+        files = [m for m in members if not m.is_dir()]
+        # Create folders up-front, workers would race each other when creating them
+        folders = {m.filename for m in members if m.is_dir()}
+        folders.update(posixpath.dirname(m.filename) + "/" for m in files if "/" in m.filename)
+        for folder in sorted(folders):
+            zip_file.extract(zipfile.ZipInfo(folder), target_dir)
+
+    handles: list[zipfile.ZipFile] = []
+    local = threading.local()
+
+    def extract(member: zipfile.ZipInfo):
+        # ZipFile is not thread-safe, each worker reads from its own handle
+        if not hasattr(local, "zip_file"):
+            local.zip_file = ZipFile(archive_path)
+            handles.append(local.zip_file)
+        local.zip_file.extract(member, target_dir)
+
+    try:
+        with ThreadPoolExecutor() as executor:
+            list(executor.map(extract, files))  # re-raises errors from workers
+    finally:
+        for handle in handles:
+            handle.close()
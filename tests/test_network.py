@@ -0,0 +1,102 @@
+import hashlib
+import os
+import pytest
+from aiohttp import web
+from pathlib import Path
+
+from ai_diffusion import network
+from ai_diffusion.network import RequestManager, NetworkError
+
+blob = os.urandom(3 * 2**20)
+
+
+async def local_server():
+    async def send_blob(request: web.Request):
+        return web.Response(body=blob, content_type="application/octet-stream")
+
+    async def redirect(request: web.Request):
+        raise web.HTTPFound("/blob")
+
+    async def text_error(request: web.Request):
+        return web.Response(status=404, text="No such file on this server")
+
+    async def json_error(request: web.Request):
+        return web.json_response({"error": "Invalid input"}, status=400)
+
+    app = web.Application()
+    app.router.add_get("/blob", send_blob)
+    app.router.add_get("/redirect", redirect)
+    app.router.add_get("/text", text_error)
+    app.router.add_get("/json", json_error)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    return runner, f"http://{host}:{port}"
+
+
+def test_network_error_payload(qtapp):
+    async def main():
+        runner, url = await local_server()
+        try:
+            net = RequestManager()
+            with pytest.raises(NetworkError) as error:
+                await net.get(f"{url}/text")
+            assert error.value.status == 404
+            assert "No such file on this server" in error.value.message
+
+            with pytest.raises(NetworkError) as error:
+                await net.get(f"{url}/json")
+            assert error.value.status == 400
+            assert error.value.data == {"error": "Invalid input"}
+            assert "Invalid input" in error.value.message
+        finally:
+            await runner.cleanup()
+
+    qtapp.run(main())
+
+
+def test_download_to(qtapp, tmp_path: Path, monkeypatch):
+    streams: list[network.HashedFile] = []
+
+    class TrackedHashedFile(network.HashedFile):
+        def __init__(self, path: Path):
+            super().__init__(path)
+            streams.append(self)
+
+    monkeypatch.setattr(network, "HashedFile", TrackedHashedFile)
+
+    async def main():
+        runner, url = await local_server()
+        try:
+            net = RequestManager()
+            for route in ["blob", "redirect"]:
+                path = tmp_path / f"{route}.bin"
+                digest = await net.download_to(f"{url}/{route}", path)
+                assert digest.hexdigest() == hashlib.sha256(blob).hexdigest()
+                assert path.read_bytes() == blob
+
+            with pytest.raises(NetworkError) as error:
+                await net.download_to(f"{url}/text", tmp_path / "missing.bin")
+            assert error.value.status == 404
+        finally:
+            await runner.cleanup()
+
+    qtapp.run(main())
+    assert len(streams) == 3
+    assert not any(stream._file.isOpen() for stream in streams)
+
+
+@pytest.mark.skipif(not Path("/dev/full").exists(), reason="Requires /dev/full")
+def test_download_to_write_error(qtapp):
+    async def main():
+        runner, url = await local_server()
+        try:
+            net = RequestManager()
+            with pytest.raises(OSError):
+                await net.download_to(f"{url}/blob", Path("/dev/full"))
+        finally:
+            await runner.cleanup()
+
+    qtapp.run(main())
@@ -1,7 +1,9 @@
+import asyncio
 import json
 from tempfile import TemporaryDirectory
 from pathlib import Path
 
+from ai_diffusion import settings as settings_module
 from ai_diffusion.settings import PerformancePreset, Settings, Setting, ServerMode
 from ai_diffusion.style import Style, Styles, StyleSettings, SamplerPreset, SamplerPresets
 from ai_diffusion.style import legacy_map as style_legacy_map
@@ -45,6 +47,73 @@ def test_save():
     )
 
 
+def test_save_skips_unchanged(tmp_path: Path, monkeypatch):
+    filepath = tmp_path / "settings.json"
+    monkeypatch.setattr(Settings, "default_path", filepath)
+    writes = []
+    original_open = open
+
+    def tracked_open(file, mode="r", *args, **kwargs):
+        if "w" in mode:
+            writes.append(file)
+        return original_open(file, mode, *args, **kwargs)
+
+    monkeypatch.setattr(settings_module, "open", tracked_open, raising=False)
+    s = Settings()
+    s.save()
+    assert json.loads(filepath.read_text())["history_size"] == s.history_size
+    assert len(writes) == 1
+
+    s.save()  # unchanged values: no write
+    assert len(writes) == 1
+
+    s.history_size = 7
+    s.save()  # changed value
+    assert json.loads(filepath.read_text())["history_size"] == 7
+    assert len(writes) == 2
+
+    filepath.unlink()
+    s.save()  # file was deleted
+    assert json.loads(filepath.read_text())["history_size"] == 7
+    assert len(writes) == 3
+
+    other = Settings()
+    other.history_size = 300
+    other.save()  # another instance overwrites the file
+    s.save()
+    assert json.loads(filepath.read_text())["history_size"] == 7
+    assert len(writes) == 5
+
+
+def test_schedule_save(qtapp, tmp_path: Path, monkeypatch):
+    filepath = tmp_path / "settings.json"
+    monkeypatch.setattr(Settings, "default_path", filepath)
+    saves = []
+    original_save = Settings.save
+
+    def counting_save(self, path=None):
+        saves.append(self.history_size)
+        original_save(self, path)
+
+    monkeypatch.setattr(Settings, "save", counting_save)
+    s = Settings()
+
+    for i in range(3):
+        s.history_size = 10 + i
+        s.schedule_save()
+    assert saves == [] and not filepath.exists()
+    qtapp.run(asyncio.sleep(0.8))
+    assert saves == [12]  # coalesced into a single write after the interval
+    assert json.loads(filepath.read_text())["history_size"] == 12
+
+    s.history_size = 20
+    s.schedule_save()
+    s.save()  # explicit save does not wait and stops the timer
+    assert saves == [12, 20]
+    qtapp.run(asyncio.sleep(0.8))
+    assert saves == [12, 20]
+
+
 def test_performance_preset():
     s = Settings()
     s.performance_preset = PerformancePreset.low
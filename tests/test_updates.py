@@ -1,11 +1,15 @@
 import os
 import pytest
+import threading
+import time
+import zipfile
 from aiohttp import ClientSession
 from pathlib import Path
 from PyQt5.QtCore import pyqtBoundSignal
 
+from ai_diffusion import updates
 from ai_diffusion.util import ZipFile
-from ai_diffusion.updates import AutoUpdate, UpdateState
+from ai_diffusion.updates import AutoUpdate, UpdateState, _extract_parallel
 from .conftest import has_local_cloud
 
 
@@ -117,3 +121,116 @@ async def test_authorization():
         # Upload requires authorization
         async with session.put("/plugin/upload/1.2.3") as response:
             assert response.status == 401
+
+
+def test_extract_parallel(tmp_path: Path, monkeypatch):
+    opened: list[zipfile.ZipFile] = []
+    used_from: dict[int, set[threading.Thread]] = {}  # handle -> threads which extracted from it
+
+    class TrackedZipFile(ZipFile):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            opened.append(self)
+
+        def extract(self, member, path=None, pwd=None):
+            used_from.setdefault(id(self), set()).add(threading.current_thread())
+            return super().extract(member, path, pwd)
+
+    monkeypatch.setattr(updates, "ZipFile", TrackedZipFile)
+
+    archive = tmp_path / "plugin.zip"
+    with ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        zip_file.writestr("test_plugin/", "")  # explicit folder entry
+        zip_file.writestr("test_plugin/nested/deeper/file.txt", "deep")
+        for i in range(32):  # folders only implied by file paths
+            zip_file.writestr(f"test_plugin/folder{i % 4}/file{i}.txt", f"content {i}" * 100)
+        zip_file.writestr("top_level.txt", "top")
+
+    target = tmp_path / "install"
+    (target / "test_plugin" / "folder0").mkdir(parents=True)
+    (target / "test_plugin" / "folder0" / "file0.txt").write_text("outdated")
+    (target / "test_plugin" / "unrelated.txt").write_text("keep me")
+    (target / "top_level.txt").write_text("outdated")
+
+    for _ in range(2):  # second run overwrites the files of the first
+        _extract_parallel(archive, target)
+
+        plugin_dir = target / "test_plugin"
+        assert (plugin_dir / "nested" / "deeper" / "file.txt").read_text() == "deep"
+        for i in range(32):
+            file = plugin_dir / f"folder{i % 4}" / f"file{i}.txt"
+            assert file.read_text() == f"content {i}" * 100
+        assert (target / "top_level.txt").read_text() == "top"
+        assert (plugin_dir / "unrelated.txt").read_text() == "keep me"
+
+    worker_handles = [z for z in opened if threading.main_thread() not in used_from.get(id(z), ())]
+    assert len(worker_handles) > 0  # files are extracted by workers
+    assert all(len(used_from[id(z)]) == 1 for z in worker_handles)  # no handle is shared
+    assert all(zip_file.fp is None for zip_file in opened)  # all handles are closed
+
+
+class NetworkStub:
+    def __init__(self, result: dict):
+        self.result = result
+        self.requests: list[str] = []
+
+    async def get(self, url: str, timeout: float | None = None):
+        self.requests.append(url)
+        return self.result
+
+
+def cached_updater(tmp_path: Path, result: dict, current_version="1.0.0"):
+    updater = AutoUpdate(
+        plugin_dir=tmp_path, current_version=current_version, api_url="http://updates"
+    )
+    updater._cache_path = tmp_path / "plugin_update.json"
+    net = NetworkStub(result)
+    updater._request_manager = net  # type: ignore
+    return updater, net
+
+
+async def test_update_check_cache(tmp_path: Path):
+    available = {"version": "1.1.0", "url": "http://updates/plugin.zip", "sha256": "abc"}
+    updater, net = cached_updater(tmp_path, available)
+
+    await updater._check(max_age=60)  # miss: fetch and store result
+    assert len(net.requests) == 1 and updater.state is UpdateState.available
+    assert updater._cache_path.exists()
+
+    await updater._check(max_age=60)  # hit
+    assert len(net.requests) == 1 and updater.state is UpdateState.available
+    assert updater._package is not None and updater._package.url == available["url"]
+
+    await updater._check()  # no max_age: always fetch
+    assert len(net.requests) == 2
+
+    now = time.time()
+    os.utime(updater._cache_path, (now - 120, now - 120))
+    await updater._check(max_age=60)  # expired
+    assert len(net.requests) == 3
+
+    os.utime(updater._cache_path, (now + 3600, now + 3600))
+    await updater._check(max_age=60)  # modified in the future, eg. clock was turned back
+    assert len(net.requests) == 4
+
+    other, other_net = cached_updater(tmp_path, available, current_version="1.0.1")
+    await other._check(max_age=60)  # different request URL
+    assert len(other_net.requests) == 1
+
+
+@pytest.mark.parametrize(
+    "result",
+    [
+        {"version": ""},
+        {"version": "1.1.0", "url": "http://updates/plugin.zip"},
+        {"version": "1.1.0", "url": "http://updates/plugin.zip", "sha256": ""},
+    ],
+)
+async def test_update_check_cache_failed(tmp_path: Path, result: dict):
+    updater, net = cached_updater(tmp_path, result)
+    await updater._check(max_age=60)
+    assert updater.state is UpdateState.failed_check
+    assert not updater._cache_path.exists()
+
+    await updater._check(max_age=60)
+    assert len(net.requests) == 2